@@ -1,16 +1,46 @@
+import json
+from functools import lru_cache
+
 from django.shortcuts import get_object_or_404, render, redirect
 from django.views import View
 from django.contrib import messages
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.http import JsonResponse
+from django.utils.decorators import method_decorator
+from django.views.decorators.csrf import csrf_exempt
 from .models import Subject, Staff, Student, StudentResult
 from .forms import EditResultForm
 from django.urls import reverse
 
 
+@lru_cache(maxsize=256)
+def _staff_subject_ids(staff_id):
+    """Per-process cache of a staff member's subject ids.
+
+    Subjects change rarely but are re-queried on every result-edit GET;
+    the cache is dropped whenever any Subject row is written or deleted.
+    """
+    return tuple(Subject.objects.filter(
+        staff_id=staff_id).values_list('id', flat=True))
+
+
+@receiver(post_save, sender=Subject)
+@receiver(post_delete, sender=Subject)
+def _clear_staff_subject_cache(sender, **kwargs):
+    _staff_subject_ids.cache_clear()
+
+
 class EditResultView(View):
     def get(self, request, *args, **kwargs):
         resultForm = EditResultForm()
-        staff = get_object_or_404(Staff, admin=request.user)
-        resultForm.fields['subject'].queryset = Subject.objects.filter(staff=staff)
+        staff = get_object_or_404(Staff.objects.select_related('admin'), admin=request.user)
+        # select_related(None) drops the default manager's eager joins;
+        # the dropdown renders names only
+        resultForm.fields['subject'].queryset = Subject.objects.filter(
+            id__in=_staff_subject_ids(staff.id)).select_related(None).only(
+            'id', 'name')
         context = {
             'form': resultForm,
             'page_title': "Edit Student's Result"
@@ -26,11 +56,12 @@ class EditResultView(View):
                 subject = form.cleaned_data.get('subject')
                 test = form.cleaned_data.get('test')
                 exam = form.cleaned_data.get('exam')
-                # Validating
-                result = StudentResult.objects.get(student=student, subject=subject)
-                result.exam = exam
-                result.test = test
-                result.save()
+                # One upsert per submit; the (student, subject) unique
+                # constraint makes this race-free without a SELECT FOR UPDATE
+                StudentResult.objects.update_or_create(
+                    student=student, subject=subject,
+                    defaults={'test': test, 'exam': exam},
+                )
                 messages.success(request, "Result Updated")
                 return redirect(reverse('edit_student_result'))
             except Exception as e:
@@ -38,3 +69,40 @@ class EditResultView(View):
         else:
             messages.warning(request, "Result Could Not Be Updated")
         return render(request, "staff_template/edit_student_result.html", context)
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class EditResultsBulkView(View):
+    """Batched counterpart of EditResultView.
+
+    Accepts a JSON array of {student, subject, test, exam} objects and
+    persists every row with a single bulk_update instead of one POST
+    (and one UPDATE) per result.
+    """
+
+    def post(self, request, *args, **kwargs):
+        staff = get_object_or_404(Staff, admin=request.user)
+        try:
+            rows = json.loads(request.POST.get('results') or request.body)
+            # Coerce the scores here too, so a row missing test/exam hits
+            # the 400 branch instead of blowing up in the loop below
+            wanted = {(int(row['student']), int(row['subject'])):
+                      (int(row['test']), int(row['exam']))
+                      for row in rows}
+        except (KeyError, TypeError, ValueError):
+            return JsonResponse({'error': 'Invalid Payload'}, status=400)
+        results = StudentResult.objects.filter(
+            student_id__in={student_id for student_id, _ in wanted},
+            subject_id__in={subject_id for _, subject_id in wanted},
+            subject__staff=staff)
+        updated = []
+        for result in results:
+            scores = wanted.get((result.student_id, result.subject_id))
+            if scores is None:
+                continue
+            result.test, result.exam = scores
+            updated.append(result)
+        with transaction.atomic():
+            StudentResult.objects.bulk_update(
+                updated, ['test', 'exam'], batch_size=1000)
+        return JsonResponse({'updated': len(updated)})
@@ -0,0 +1,54 @@
+"""Packed presence bitmaps for Attendance.
+
+AttendanceReport stores one boolean row per (student, attendance), so a
+semester of records for one class is tens of thousands of rows and any
+"who was present" aggregate scans them all. Attendance.status_bitmap
+packs the same vector at one bit per student — bit N belongs to the Nth
+student of the course/session cohort ordered by ascending student id —
+so aggregate presence checks read a single row.
+
+AttendanceReport stays the canonical per-student record (the staff,
+student and HOD views all read it); the bitmap is a denormalization
+refreshed whenever reports for an attendance are written.
+"""
+from .models import Attendance, AttendanceReport, Student, Subject
+
+
+def student_bit_indexes(course_id, session_id):
+    """Map student id -> bit position for one course/session cohort."""
+    ids = Student.objects.filter(
+        course_id=course_id, session_id=session_id
+    ).order_by('id').values_list('id', flat=True)
+    return {student_id: index for index, student_id in enumerate(ids)}
+
+
+def pack_statuses(statuses, size):
+    """Pack (bit_index, present) pairs into a bytes bitmap of `size` bits."""
+    bitmap = bytearray((size + 7) // 8)
+    for index, present in statuses:
+        if present:
+            bitmap[index // 8] |= 1 << (index % 8)
+    return bytes(bitmap)
+
+
+def is_present(bitmap, index):
+    """Test one student's bit in a packed bitmap."""
+    byte = index // 8
+    if byte >= len(bitmap):
+        return False
+    return bool(bitmap[byte] >> (index % 8) & 1)
+
+
+def refresh_status_bitmap(attendance):
+    """Rebuild an attendance's bitmap from its AttendanceReport rows."""
+    course_id = Subject.objects.values_list(
+        'course_id', flat=True).get(pk=attendance.subject_id)
+    indexes = student_bit_indexes(course_id, attendance.session_id)
+    statuses = AttendanceReport.objects.filter(
+        attendance=attendance).values_list('student_id', 'status')
+    bitmap = pack_statuses(
+        ((indexes[student_id], bool(status))
+         for student_id, status in statuses if student_id in indexes),
+        len(indexes))
+    Attendance.objects.filter(pk=attendance.pk).update(status_bitmap=bitmap)
+    return bitmap
@@ -1,4 +1,5 @@
 from django import forms
+from django.core.exceptions import ValidationError
 from django.forms.widgets import DateInput, TextInput
 
 from .models import *
@@ -6,10 +7,21 @@ from .models import *
 
 class FormSettings(forms.ModelForm):
     def __init__(self, *args, **kwargs):
+        # Style the class-level base_fields once per form class; instances
+        # deep-copy base_fields in super().__init__, so every later
+        # instantiation inherits the attrs without re-walking the fields.
+        # The names of the styled (non-hidden) fields are cached on the
+        # class for anything that needs the visible-field list without
+        # allocating it again.
+        cls = type(self)
+        if '_styled_fields' not in cls.__dict__:
+            styled = []
+            for name, field in cls.base_fields.items():
+                if not field.widget.is_hidden:
+                    field.widget.attrs.setdefault('class', 'form-control')
+                    styled.append(name)
+            cls._styled_fields = tuple(styled)
         super(FormSettings, self).__init__(*args, **kwargs)
-        # Here make some changes such as:
-        for field in self.visible_fields():
-            field.field.widget.attrs['class'] = 'form-control'
 
 
 class CustomUserForm(FormSettings):
@@ -25,6 +37,9 @@ class CustomUserForm(FormSettings):
     profile_pic = forms.ImageField()
 
     def __init__(self, *args, **kwargs):
+        # Callers should pass an instance fetched with
+        # .select_related('admin') so reading the admin user below reuses
+        # the joined row instead of issuing a second SELECT.
         super(CustomUserForm, self).__init__(*args, **kwargs)
 
         if kwargs.get('instance'):
@@ -37,17 +52,11 @@ class CustomUserForm(FormSettings):
 
     def clean_email(self, *args, **kwargs):
         formEmail = self.cleaned_data['email'].lower()
-        if self.instance.pk is None:  # Insert
-            if CustomUser.objects.filter(email=formEmail).exists():
-                raise forms.ValidationError(
-                    "The given email is already registered")
-        else:  # Update
-            dbEmail = self.Meta.model.objects.get(
-                id=self.instance.pk).admin.email.lower()
-            if dbEmail != formEmail:  # There has been changes
-                if CustomUser.objects.filter(email=formEmail).exists():
-                    raise forms.ValidationError("The given email is already registered")
-
+        qs = CustomUser.objects.filter(email=formEmail)
+        if self.instance.pk is not None:  # Update: ignore the user's own row
+            qs = qs.exclude(pk=self.instance.admin_id)
+        if qs.exists():
+            raise forms.ValidationError("The given email is already registered")
         return formEmail
 
     class Meta:
@@ -55,38 +64,28 @@ class CustomUserForm(FormSettings):
         fields = ['first_name', 'last_name', 'email', 'gender',  'password','profile_pic', 'address' ]
 
 
-class StudentForm(CustomUserForm):
-    def __init__(self, *args, **kwargs):
-        super(StudentForm, self).__init__(*args, **kwargs)
-
-    class Meta(CustomUserForm.Meta):
-        model = Student
-        fields = CustomUserForm.Meta.fields + \
-            ['course', 'session']
-
-
-class AdminForm(CustomUserForm):
-    def __init__(self, *args, **kwargs):
-        super(AdminForm, self).__init__(*args, **kwargs)
-
-    class Meta(CustomUserForm.Meta):
-        model = Admin
-        fields = CustomUserForm.Meta.fields
+def make_user_form(name, model, extra_fields=()):
+    """Build a CustomUserForm subclass for `model`.
 
+    The add/edit user forms differ only in their Meta model and field
+    list, so generating them spares each pair its own boilerplate class
+    body (and the metaclass work of an empty __init__ override).
+    """
+    meta = type('Meta', (CustomUserForm.Meta,),
+                {'model': model,
+                 'fields': CustomUserForm.Meta.fields + list(extra_fields)})
+    return type(CustomUserForm)(name, (CustomUserForm,),
+                                {'Meta': meta, '__module__': __name__})
 
-class StaffForm(CustomUserForm):
-    def __init__(self, *args, **kwargs):
-        super(StaffForm, self).__init__(*args, **kwargs)
 
-    class Meta(CustomUserForm.Meta):
-        model = Staff
-        fields = CustomUserForm.Meta.fields + \
-            ['course' ]
+StudentForm = make_user_form('StudentForm', Student, ['course', 'session'])
+AdminForm = make_user_form('AdminForm', Admin)
+StaffForm = make_user_form('StaffForm', Staff, ['course'])
+StudentEditForm = make_user_form('StudentEditForm', Student)
+StaffEditForm = make_user_form('StaffEditForm', Staff)
 
 
 class CourseForm(FormSettings):
-    def __init__(self, *args, **kwargs):
-        super(CourseForm, self).__init__(*args, **kwargs)
 
     class Meta:
         fields = ['name']
@@ -97,6 +96,11 @@ class SubjectForm(FormSettings):
 
     def __init__(self, *args, **kwargs):
         super(SubjectForm, self).__init__(*args, **kwargs)
+        # Staff.__str__ only needs the name columns; skip the wide
+        # text/image columns when rendering the staff dropdown
+        self.fields['staff'].queryset = Staff.objects.select_related(
+            'admin').defer('admin__address', 'admin__fcm_token',
+                           'admin__profile_pic', 'admin__password')
 
     class Meta:
         model = Subject
@@ -104,8 +108,6 @@ class SubjectForm(FormSettings):
 
 
 class SessionForm(FormSettings):
-    def __init__(self, *args, **kwargs):
-        super(SessionForm, self).__init__(*args, **kwargs)
 
     class Meta:
         model = Session
@@ -117,8 +119,6 @@ class SessionForm(FormSettings):
 
 
 class LeaveReportStaffForm(FormSettings):
-    def __init__(self, *args, **kwargs):
-        super(LeaveReportStaffForm, self).__init__(*args, **kwargs)
 
     class Meta:
         model = LeaveReportStaff
@@ -130,17 +130,12 @@ class LeaveReportStaffForm(FormSettings):
 
 class FeedbackStaffForm(FormSettings):
 
-    def __init__(self, *args, **kwargs):
-        super(FeedbackStaffForm, self).__init__(*args, **kwargs)
-
     class Meta:
         model = FeedbackStaff
         fields = ['feedback']
 
 
 class LeaveReportStudentForm(FormSettings):
-    def __init__(self, *args, **kwargs):
-        super(LeaveReportStudentForm, self).__init__(*args, **kwargs)
 
     class Meta:
         model = LeaveReportStudent
@@ -152,39 +147,40 @@ class LeaveReportStudentForm(FormSettings):
 
 class FeedbackStudentForm(FormSettings):
 
-    def __init__(self, *args, **kwargs):
-        super(FeedbackStudentForm, self).__init__(*args, **kwargs)
-
     class Meta:
         model = FeedbackStudent
         fields = ['feedback']
 
 
-class StudentEditForm(CustomUserForm):
-    def __init__(self, *args, **kwargs):
-        super(StudentEditForm, self).__init__(*args, **kwargs)
-
-    class Meta(CustomUserForm.Meta):
-        model = Student
-        fields = CustomUserForm.Meta.fields 
-
-
-class StaffEditForm(CustomUserForm):
-    def __init__(self, *args, **kwargs):
-        super(StaffEditForm, self).__init__(*args, **kwargs)
-
-    class Meta(CustomUserForm.Meta):
-        model = Staff
-        fields = CustomUserForm.Meta.fields
-
-
 class EditResultForm(FormSettings):
-    session_list = Session.objects.all()
     session_year = forms.ModelChoiceField(
-        label="Session Year", queryset=session_list, required=True)
+        label="Session Year", queryset=Session.objects.none(), required=True)
 
     def __init__(self, *args, **kwargs):
         super(EditResultForm, self).__init__(*args, **kwargs)
+        # Only fetch the columns __str__ needs. Student.__str__ reads the
+        # admin name columns, so join the user row or the dropdown issues
+        # one query per option; select_related(None) first drops the
+        # default manager's wider joins, which only() would clash with.
+        self.fields['session_year'].queryset = Session.objects.only(
+            'id', 'start_year', 'end_year')
+        self.fields['student'].queryset = Student.objects.select_related(
+            None).select_related('admin').only(
+            'id', 'admin__first_name', 'admin__last_name')
+
+    def validate_unique(self):
+        # The view upserts via update_or_create, so an existing
+        # (student, subject) row is the expected update case; without
+        # this exclusion the unique constraint rejects every edit of a
+        # result that already exists.
+        exclude = self._get_validation_exclusions()
+        for name in ('student', 'subject'):
+            if name not in exclude:
+                exclude.append(name)
+        try:
+            self.instance.validate_unique(exclude=exclude)
+        except ValidationError as e:
+            self._update_errors(e)
 
     class Meta:
         model = StudentResult
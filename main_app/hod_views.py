@@ -160,7 +160,8 @@ def add_subject(request):
 
 
 def manage_staff(request):
-    allStaff = CustomUser.objects.filter(user_type=2)
+    allStaff = CustomUser.objects.filter(user_type=2).defer(
+        'address', 'fcm_token', 'password')
     context = {
         'allStaff': allStaff,
         'page_title': 'Manage Staff'
@@ -169,7 +170,8 @@ def manage_staff(request):
 
 
 def manage_student(request):
-    students = CustomUser.objects.filter(user_type=3)
+    students = CustomUser.objects.filter(user_type=3).defer(
+        'address', 'fcm_token', 'password')
     context = {
         'students': students,
         'page_title': 'Manage Students'
@@ -196,7 +198,7 @@ def manage_subject(request):
 
 
 def edit_staff(request, staff_id):
-    staff = get_object_or_404(Staff, id=staff_id)
+    staff = get_object_or_404(Staff.objects.select_related('admin'), id=staff_id)
     form = StaffForm(request.POST or None, instance=staff)
     context = {
         'form': form,
@@ -245,7 +247,7 @@ def edit_staff(request, staff_id):
 
 
 def edit_student(request, student_id):
-    student = get_object_or_404(Student, id=student_id)
+    student = get_object_or_404(Student.objects.select_related('admin'), id=student_id)
     form = StudentForm(request.POST or None, instance=student)
     context = {
         'form': form,
@@ -531,7 +533,7 @@ def get_admin_attendance(request):
 
 
 def admin_view_profile(request):
-    admin = get_object_or_404(Admin, admin=request.user)
+    admin = get_object_or_404(Admin.objects.select_related('admin'), admin=request.user)
     form = AdminForm(request.POST or None, request.FILES or None,
                      instance=admin)
     context = {'form': form,
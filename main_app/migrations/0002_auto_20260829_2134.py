@@ -0,0 +1,21 @@
+# Generated by Django 3.1.1 on 2026-08-29 20:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='studentresult',
+            index=models.Index(fields=['student', 'subject'], name='main_app_st_student_518d7e_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='studentresult',
+            constraint=models.UniqueConstraint(fields=('student', 'subject'), name='uniq_student_subject_result'),
+        ),
+    ]
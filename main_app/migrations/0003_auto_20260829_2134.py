@@ -0,0 +1,41 @@
+# Generated by Django 3.1.1 on 2026-08-29 20:34
+from datetime import datetime
+
+from django.db import migrations, models
+
+
+def normalize_dates(apps, schema_editor):
+    """Rewrite legacy string dates to ISO form so the column cast is safe."""
+    formats = ('%Y-%m-%d', '%d-%m-%Y', '%d/%m/%Y', '%m/%d/%Y')
+    for model_name in ('LeaveReportStaff', 'LeaveReportStudent'):
+        model = apps.get_model('main_app', model_name)
+        for report in model.objects.all().iterator():
+            for fmt in formats:
+                try:
+                    parsed = datetime.strptime(report.date.strip(), fmt)
+                except (AttributeError, ValueError):
+                    continue
+                report.date = parsed.strftime('%Y-%m-%d')
+                report.save(update_fields=['date'])
+                break
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0002_auto_20260829_2134'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_dates, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='leavereportstaff',
+            name='date',
+            field=models.DateField(db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='leavereportstudent',
+            name='date',
+            field=models.DateField(db_index=True),
+        ),
+    ]
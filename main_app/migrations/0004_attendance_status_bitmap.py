@@ -0,0 +1,18 @@
+# Generated by Django 3.1.1 on 2026-08-29 20:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0003_auto_20260829_2134'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attendance',
+            name='status_bitmap',
+            field=models.BinaryField(default=bytes),
+        ),
+    ]
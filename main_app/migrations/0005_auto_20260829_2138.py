@@ -0,0 +1,32 @@
+# Generated by Django 3.1.1 on 2026-08-29 20:38
+
+import django.core.validators
+from django.db import migrations, models
+from django.db.models.functions import Round
+
+
+def round_scores(apps, schema_editor):
+    """Round any fractional grades so the integer cast loses nothing."""
+    StudentResult = apps.get_model('main_app', 'StudentResult')
+    StudentResult.objects.update(test=Round('test'), exam=Round('exam'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0004_attendance_status_bitmap'),
+    ]
+
+    operations = [
+        migrations.RunPython(round_scores, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='studentresult',
+            name='exam',
+            field=models.PositiveSmallIntegerField(default=0, validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(100)]),
+        ),
+        migrations.AlterField(
+            model_name='studentresult',
+            name='test',
+            field=models.PositiveSmallIntegerField(default=0, validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(100)]),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 3.1.1 on 2026-08-29 20:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0005_auto_20260829_2138'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notificationstaff',
+            index=models.Index(fields=['staff', '-created_at'], name='main_app_no_staff_i_12d2b4_idx'),
+        ),
+    ]
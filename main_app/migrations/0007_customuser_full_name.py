@@ -0,0 +1,27 @@
+# Generated by Django 3.1.1 on 2026-08-29 20:44
+
+from django.db import migrations, models
+from django.db.models import F, Value
+from django.db.models.functions import Concat
+
+
+def backfill_full_name(apps, schema_editor):
+    CustomUser = apps.get_model('main_app', 'CustomUser')
+    CustomUser.objects.update(
+        full_name=Concat(F('last_name'), Value(' '), F('first_name')))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0006_auto_20260829_2144'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='full_name',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=255),
+        ),
+        migrations.RunPython(backfill_full_name, migrations.RunPython.noop),
+    ]
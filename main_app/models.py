@@ -5,8 +5,9 @@
 """
 from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import UserManager
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.dispatch import receiver
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, pre_save
 from django.db import models
 from django.contrib.auth.models import AbstractUser
 
@@ -100,6 +101,8 @@ class CustomUser(AbstractUser):
     gender = models.CharField(max_length=1, choices=GENDER)
     profile_pic = models.ImageField()
     address = models.TextField()
+    # 冗余存储"姓 名"全名（pre_save维护），列表查询只需取这一列
+    full_name = models.CharField(max_length=255, db_index=True, blank=True, default="")
     fcm_token = models.TextField(default="")  # For firebase notifications
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -143,6 +146,13 @@ class Course(models.Model):
         return self.name
 
 
+class StudentManager(models.Manager):
+    """默认联表查询学生的关联行，从源头消除逐行N+1查询"""
+    def get_queryset(self):
+        return super().get_queryset().select_related(
+            'admin', 'course', 'session')
+
+
 class Student(models.Model):
 
     """
@@ -153,19 +163,36 @@ class Student(models.Model):
     course = models.ForeignKey(Course, on_delete=models.DO_NOTHING, null=True, blank=False) #关联学生所修读的课程
     session = models.ForeignKey(Session, on_delete=models.DO_NOTHING, null=True) # 关联学生所在的学期/学年
 
+    objects = StudentManager()
+
     def __str__(self):
         return self.admin.last_name + ", " + self.admin.first_name
 
 
+class StaffManager(models.Manager):
+    """默认联表查询教职工的用户和课程行"""
+    def get_queryset(self):
+        return super().get_queryset().select_related('admin', 'course')
+
+
 class Staff(models.Model):
     """教职工信息"""
     course = models.ForeignKey(Course, on_delete=models.DO_NOTHING, null=True, blank=False)
     admin = models.OneToOneField(CustomUser, on_delete=models.CASCADE)
 
+    objects = StaffManager()
+
     def __str__(self):
         return self.admin.last_name + " " + self.admin.first_name
 
 
+class SubjectManager(models.Manager):
+    """默认联表查询科目的任课教师（含其用户行）和课程行"""
+    def get_queryset(self):
+        return super().get_queryset().select_related(
+            'staff__admin', 'course')
+
+
 class Subject(models.Model):
     """科目信息"""
     name = models.CharField(max_length=120)
@@ -176,6 +203,8 @@ class Subject(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = SubjectManager()
+
     # 定义模型的字符串表示方法，返回科目名称
     def __str__(self):
         return self.name
@@ -190,6 +219,8 @@ class Attendance(models.Model):
     session = models.ForeignKey(Session, on_delete=models.DO_NOTHING)
     subject = models.ForeignKey(Subject, on_delete=models.DO_NOTHING)
     date = models.DateField()  # 考勤日期
+    # 出勤位图：按学生id升序每人1位，见 attendance_bitmap.py
+    status_bitmap = models.BinaryField(default=bytes, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -209,7 +240,7 @@ class AttendanceReport(models.Model):
 class LeaveReportStudent(models.Model):
     """请假申请模型类，处理学生的请假申请"""
     student = models.ForeignKey(Student, on_delete=models.CASCADE)
-    date = models.CharField(max_length=60)
+    date = models.DateField(db_index=True)
     message = models.TextField()
     status = models.SmallIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -219,7 +250,7 @@ class LeaveReportStudent(models.Model):
 class LeaveReportStaff(models.Model):
     """请假申请模型类，处理教职工的请假申请"""
     staff = models.ForeignKey(Staff, on_delete=models.CASCADE)
-    date = models.CharField(max_length=60)
+    date = models.DateField(db_index=True)
     message = models.TextField()
     status = models.SmallIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -251,6 +282,10 @@ class NotificationStaff(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        # 通知列表按教职工过滤并按时间倒序，复合索引支持索引顺序扫描
+        indexes = [models.Index(fields=['staff', '-created_at'])]
+
 
 class NotificationStudent(models.Model):
     """通知系统模型类，处理学生的通知信息"""
@@ -264,30 +299,38 @@ class StudentResult(models.Model):
     """学生成绩模型类，记录学生的成绩信息"""
     student = models.ForeignKey(Student, on_delete=models.CASCADE)
     subject = models.ForeignKey(Subject, on_delete=models.CASCADE)
-    test = models.FloatField(default=0)
-    exam = models.FloatField(default=0)
+    # 成绩为0-100的整数，用小整数列代替浮点列以节省存储
+    test = models.PositiveSmallIntegerField(
+        default=0, validators=[MinValueValidator(0), MaxValueValidator(100)])
+    exam = models.PositiveSmallIntegerField(
+        default=0, validators=[MinValueValidator(0), MaxValueValidator(100)])
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        # 每个学生每门科目只有一条成绩记录，索引用于加速按(学生,科目)查询
+        constraints = [
+            models.UniqueConstraint(
+                fields=['student', 'subject'],
+                name='uniq_student_subject_result'),
+        ]
+        indexes = [models.Index(fields=['student', 'subject'])]
 
-@receiver(post_save, sender=CustomUser)
-def create_user_profile(sender, instance, created, **kwargs):
-    """当创建用户时，根据用户类型创建相应的用户子类实例"""
-    if created:
-        if instance.user_type == 1:
-            Admin.objects.create(admin=instance)
-        if instance.user_type == 2:
-            Staff.objects.create(admin=instance)
-        if instance.user_type == 3:
-            Student.objects.create(admin=instance)
+
+@receiver(pre_save, sender=CustomUser)
+def set_full_name(sender, instance, **kwargs):
+    """保存前预计算全名，读侧无需再逐行拼接姓名"""
+    instance.full_name = instance.last_name + " " + instance.first_name
 
 
 @receiver(post_save, sender=CustomUser)
-def save_user_profile(sender, instance, **kwargs):
-    """当保存用户时，根据用户类型保存相应的用户子类实例"""
-    if instance.user_type == 1:
-        instance.admin.save()
-    if instance.user_type == 2:
-        instance.staff.save()
-    if instance.user_type == 3:
-        instance.student.save()
+def create_user_profile(sender, instance, created, **kwargs):
+    """当创建用户时，根据用户类型创建相应的用户子类实例"""
+    if not created:
+        return
+    # user_type is a CharField, so instances loaded from the DB carry "1"
+    # while fresh ones may carry 1 — normalize before dispatching. A dict
+    # lookup also avoids re-testing the field three times per save.
+    profile_model = {1: Admin, 2: Staff, 3: Student}.get(int(instance.user_type))
+    if profile_model is not None:
+        profile_model.objects.create(admin=instance)
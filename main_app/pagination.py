@@ -0,0 +1,26 @@
+"""Pagination helpers.
+
+CachingPaginator keeps the COUNT(*) that Paginator runs per page render
+out of hot list views: the total is cached under the caller's key and
+reused until the TTL expires or the view deletes the key after a write.
+"""
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
+
+
+class CachingPaginator(Paginator):
+    def __init__(self, object_list, per_page, cache_key, timeout=300,
+                 **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.cache_key = cache_key
+        self.timeout = timeout
+
+    @cached_property
+    def count(self):
+        def _count():
+            try:
+                return self.object_list.count()
+            except (AttributeError, TypeError):
+                return len(self.object_list)
+        return cache.get_or_set(self.cache_key, _count, self.timeout)
@@ -1,35 +1,117 @@
 import json
+import os
+from uuid import uuid4
 
 from django.contrib import messages
+from django.core.cache import cache
 from django.core.files.storage import FileSystemStorage
-from django.http import HttpResponse, JsonResponse
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.http import (Http404, HttpResponse, JsonResponse,
+                         StreamingHttpResponse)
 from django.shortcuts import (HttpResponseRedirect, get_object_or_404,redirect, render)
 from django.urls import reverse
 from django.views.decorators.csrf import csrf_exempt
 
 from .forms import *
 from .models import *
+from .pagination import CachingPaginator
+from .tasks import persist_attendance, persist_attendance_updates
+
+try:
+    # C-accelerated parser for the attendance payloads, which can run to
+    # tens of KB for a large class; optional, stdlib json otherwise
+    from orjson import loads as _loads
+except ImportError:
+    _loads = json.loads
+
+# Shared storage instance; MEDIA_ROOT/MEDIA_URL are resolved once instead
+# of per upload
+_profile_fs = FileSystemStorage()
+
+
+def _get_subject(subject_id):
+    """Cached Subject lookup for the hot AJAX handlers (5 minute TTL)."""
+    try:
+        return cache.get_or_set(
+            'subject:%s' % subject_id,
+            lambda: Subject.objects.get(pk=subject_id), 300)
+    except Subject.DoesNotExist:
+        raise Http404("No Subject matches the given query.")
+
+
+def _staff_subjects(staff):
+    """Cached id/name list of a staff member's subjects (5 minute TTL)."""
+    return cache.get_or_set(
+        'staff_subjects:%s' % staff.pk,
+        lambda: list(Subject.objects.filter(staff=staff)
+                     .select_related(None).only('id', 'name')), 300)
+
+
+def _all_sessions():
+    """Cached list of every session; global and rarely changing (1h TTL)."""
+    return cache.get_or_set(
+        'all_sessions',
+        lambda: list(Session.objects.only('id', 'start_year', 'end_year')),
+        3600)
+
+
+@receiver([post_save, post_delete], sender=Subject)
+def _clear_staff_subjects_cache(sender, instance, **kwargs):
+    cache.delete('staff_subjects:%s' % instance.staff_id)
+    cache.delete('subject:%s' % instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Session)
+def _clear_sessions_cache(sender, instance, **kwargs):
+    cache.delete('all_sessions')
+    cache.delete('session:%s' % instance.pk)
+
+
+def _stream_json(rows):
+    """Yield a JSON array chunk by chunk so large payloads stay O(1) in
+    memory and the first bytes go out while rows are still being read."""
+    yield '['
+    for index, row in enumerate(rows):
+        yield (',' if index else '') + json.dumps(row)
+    yield ']'
+
+
+def _get_session(session_id):
+    """Cached Session lookup for the hot AJAX handlers (5 minute TTL)."""
+    try:
+        return cache.get_or_set(
+            'session:%s' % session_id,
+            lambda: Session.objects.get(pk=session_id), 300)
+    except Session.DoesNotExist:
+        raise Http404("No Session matches the given query.")
 
 
 def staff_home(request):
     staff = get_object_or_404(Staff, admin=request.user)
-    total_students = Student.objects.filter(course=staff.course).count()
-    total_leave = LeaveReportStaff.objects.filter(staff=staff).count()
-    subjects = Subject.objects.filter(staff=staff)
-    total_subject = subjects.count()
-    attendance_list = Attendance.objects.filter(subject__in=subjects)
-    total_attendance = attendance_list.count()
-    attendance_list = []
-    subject_list = []
-    for subject in subjects:
-        attendance_count = Attendance.objects.filter(subject=subject).count()
-        subject_list.append(subject.name)
-        attendance_list.append(attendance_count)
+    # Two queries cover every dashboard number: one aggregate over the
+    # staff row for the scalar counts, one grouped query for the
+    # per-subject chart data (the totals fall out of the same rows)
+    counts = Staff.objects.filter(pk=staff.pk).aggregate(
+        total_students=Count('course__student', distinct=True),
+        total_leave=Count('leavereportstaff', distinct=True))
+    rows = list(Subject.objects.filter(staff=staff).annotate(
+        att_count=Count('attendance')).values_list('name', 'att_count'))
+    subject_list = [name for name, _ in rows]
+    attendance_list = [att_count for _, att_count in rows]
+    total_subject = len(rows)
+    total_attendance = sum(attendance_list)
     context = {
-        'page_title': 'Staff Panel - ' + str(staff.admin.last_name) + ' (' + str(staff.course) + ')',
-        'total_students': total_students,
+        # staff comes joined with admin and course by the default manager,
+        # so formatting from the scalar fields issues no extra queries;
+        # course stays None until the HOD assigns one
+        'page_title': f'Staff Panel - {staff.admin.last_name} '
+                      f'({staff.course.name if staff.course else None})',
+        'total_students': counts['total_students'],
         'total_attendance': total_attendance,
-        'total_leave': total_leave,
+        'total_leave': counts['total_leave'],
         'total_subject': total_subject,
         'subject_list': subject_list,
         'attendance_list': attendance_list
@@ -39,11 +121,9 @@ def staff_home(request):
 
 def staff_take_attendance(request):
     staff = get_object_or_404(Staff, admin=request.user)
-    subjects = Subject.objects.filter(staff_id=staff)
-    sessions = Session.objects.all()
     context = {
-        'subjects': subjects,
-        'sessions': sessions,
+        'subjects': _staff_subjects(staff),
+        'sessions': _all_sessions(),
         'page_title': 'Take Attendance'
     }
 
@@ -55,20 +135,18 @@ def get_students(request):
     subject_id = request.POST.get('subject')
     session_id = request.POST.get('session')
     try:
-        subject = get_object_or_404(Subject, id=subject_id)
-        session = get_object_or_404(Session, id=session_id)
+        subject = _get_subject(subject_id)
+        session = _get_session(session_id)
         students = Student.objects.filter(
-            course_id=subject.course.id, session=session)
-        student_data = []
-        for student in students:
-            data = {
-                    "id": student.id,
-                    "name": student.admin.last_name + " " + student.admin.first_name
-                    }
-            student_data.append(data)
-        return JsonResponse(json.dumps(student_data), content_type='application/json', safe=False)
+            course_id=subject.course_id, session=session).values(
+            'id', 'admin__full_name').iterator(chunk_size=500)
+        student_data = (
+            {"id": student['id'], "name": student['admin__full_name']}
+            for student in students)
+        return StreamingHttpResponse(
+            _stream_json(student_data), content_type='application/json')
     except Exception as e:
-        return e
+        return JsonResponse({'error': str(e)}, status=400)
 
 
 
@@ -78,38 +156,30 @@ def save_attendance(request):
     date = request.POST.get('date')
     subject_id = request.POST.get('subject')
     session_id = request.POST.get('session')
-    students = json.loads(student_data)
     try:
-        session = get_object_or_404(Session, id=session_id)
-        subject = get_object_or_404(Subject, id=subject_id)
+        # Parse and normalize the payload once up front so a malformed
+        # body fails here instead of inside the task
+        rows = [(int(student_dict['id']), student_dict.get('status'))
+                for student_dict in _loads(student_data)]
+        session = _get_session(session_id)
+        subject = _get_subject(subject_id)
 
         # Check if an attendance object already exists for the given date and session
         attendance, created = Attendance.objects.get_or_create(session=session, subject=subject, date=date)
 
-        for student_dict in students:
-            student = get_object_or_404(Student, id=student_dict.get('id'))
-
-            # Check if an attendance report already exists for the student and the attendance object
-            attendance_report, report_created = AttendanceReport.objects.get_or_create(student=student, attendance=attendance)
-
-            # Update the status only if the attendance report was newly created
-            if report_created:
-                attendance_report.status = student_dict.get('status')
-                attendance_report.save()
+        persist_attendance.delay(attendance.id, rows)
 
     except Exception as e:
-        return None
+        return HttpResponse(status=500)
 
-    return HttpResponse("OK")
+    return HttpResponse("OK", status=202)
 
 
 def staff_update_attendance(request):
     staff = get_object_or_404(Staff, admin=request.user)
-    subjects = Subject.objects.filter(staff_id=staff)
-    sessions = Session.objects.all()
     context = {
-        'subjects': subjects,
-        'sessions': sessions,
+        'subjects': _staff_subjects(staff),
+        'sessions': _all_sessions(),
         'page_title': 'Update Attendance'
     }
 
@@ -121,44 +191,52 @@ def get_student_attendance(request):
     attendance_date_id = request.POST.get('attendance_date_id')
     try:
         date = get_object_or_404(Attendance, id=attendance_date_id)
-        attendance_data = AttendanceReport.objects.filter(attendance=date)
-        student_data = []
-        for attendance in attendance_data:
-            data = {"id": attendance.student.admin.id,
-                    "name": attendance.student.admin.last_name + " " + attendance.student.admin.first_name,
-                    "status": attendance.status}
-            student_data.append(data)
-        return JsonResponse(json.dumps(student_data), content_type='application/json', safe=False)
+        # Project just the needed columns in one joined query; the old
+        # loop lazily fetched the Student and CustomUser rows per report
+        attendance_data = AttendanceReport.objects.filter(
+            attendance=date).values(
+            'status', 'student__admin__id', 'student__admin__full_name'
+        ).iterator(chunk_size=500)
+        student_data = (
+            {"id": attendance['student__admin__id'],
+             "name": attendance['student__admin__full_name'],
+             "status": attendance['status']}
+            for attendance in attendance_data)
+        return StreamingHttpResponse(
+            _stream_json(student_data), content_type='application/json')
     except Exception as e:
-        return e
+        return JsonResponse({'error': str(e)}, status=400)
 
 
 @csrf_exempt
 def update_attendance(request):
     student_data = request.POST.get('student_ids')
     date = request.POST.get('date')
-    students = json.loads(student_data)
     try:
+        # The payload keys students by their admin (user) id; parse and
+        # normalize once, then defer the batched rewrite to a task
+        rows = [(int(student_dict['id']), student_dict.get('status'))
+                for student_dict in _loads(student_data)]
         attendance = get_object_or_404(Attendance, id=date)
-
-        for student_dict in students:
-            student = get_object_or_404(
-                Student, admin_id=student_dict.get('id'))
-            attendance_report = get_object_or_404(AttendanceReport, student=student, attendance=attendance)
-            attendance_report.status = student_dict.get('status')
-            attendance_report.save()
+        persist_attendance_updates.delay(attendance.id, rows)
     except Exception as e:
-        return None
+        return HttpResponse(status=500)
 
-    return HttpResponse("OK")
+    return HttpResponse("OK", status=202)
 
 
 def staff_apply_leave(request):
     form = LeaveReportStaffForm(request.POST or None)
     staff = get_object_or_404(Staff, admin_id=request.user.id)
+    # Paginate with a cached count so repeated GETs skip the COUNT(*);
+    # the key is dropped below whenever a new application is saved
+    leave_count_key = 'staff_leave_count:%s' % staff.pk
+    leave_pages = CachingPaginator(
+        LeaveReportStaff.objects.filter(staff=staff).order_by('-created_at'),
+        100, cache_key=leave_count_key)
     context = {
         'form': form,
-        'leave_history': LeaveReportStaff.objects.filter(staff=staff),
+        'leave_history': leave_pages.get_page(request.GET.get('page')),
         'page_title': 'Apply for Leave'
     }
     if request.method == 'POST':
@@ -167,6 +245,7 @@ def staff_apply_leave(request):
                 obj = form.save(commit=False)
                 obj.staff = staff
                 obj.save()
+                cache.delete(leave_count_key)
                 messages.success(
                     request, "Application for leave has been submitted for review")
                 return redirect(reverse('staff_apply_leave'))
@@ -180,9 +259,13 @@ def staff_apply_leave(request):
 def staff_feedback(request):
     form = FeedbackStaffForm(request.POST or None)
     staff = get_object_or_404(Staff, admin_id=request.user.id)
+    feedback_count_key = 'staff_feedback_count:%s' % staff.pk
+    feedback_pages = CachingPaginator(
+        FeedbackStaff.objects.filter(staff=staff).order_by('-created_at'),
+        100, cache_key=feedback_count_key)
     context = {
         'form': form,
-        'feedbacks': FeedbackStaff.objects.filter(staff=staff),
+        'feedbacks': feedback_pages.get_page(request.GET.get('page')),
         'page_title': 'Add Feedback'
     }
     if request.method == 'POST':
@@ -191,6 +274,7 @@ def staff_feedback(request):
                 obj = form.save(commit=False)
                 obj.staff = staff
                 obj.save()
+                cache.delete(feedback_count_key)
                 messages.success(request, "Feedback submitted for review")
                 return redirect(reverse('staff_feedback'))
             except Exception:
@@ -201,7 +285,7 @@ def staff_feedback(request):
 
 
 def staff_view_profile(request):
-    staff = get_object_or_404(Staff, admin=request.user)
+    staff = get_object_or_404(Staff.objects.select_related('admin'), admin=request.user)
     form = StaffEditForm(request.POST or None, request.FILES or None,instance=staff)
     context = {'form': form, 'page_title': 'View/Update Profile'}
     if request.method == 'POST':
@@ -214,18 +298,29 @@ def staff_view_profile(request):
                 gender = form.cleaned_data.get('gender')
                 passport = request.FILES.get('profile_pic') or None
                 admin = staff.admin
+                # Persist only the columns this form can change; a bare
+                # save() rewrites every column including the password
+                # hash. full_name is recomputed by the pre_save hook and
+                # updated_at is auto_now, so both must be listed too.
+                dirty = ['first_name', 'last_name', 'address', 'gender',
+                         'full_name', 'updated_at']
                 if password != None:
                     admin.set_password(password)
+                    dirty.append('password')
                 if passport != None:
-                    fs = FileSystemStorage()
-                    filename = fs.save(passport.name, passport)
-                    passport_url = fs.url(filename)
+                    # A unique name spares the storage layer its stat()
+                    # probes for name_<n>.ext when uploads collide
+                    extension = os.path.splitext(passport.name)[1]
+                    filename = _profile_fs.save(
+                        uuid4().hex + extension, passport)
+                    passport_url = _profile_fs.url(filename)
                     admin.profile_pic = passport_url
+                    dirty.append('profile_pic')
                 admin.first_name = first_name
                 admin.last_name = last_name
                 admin.address = address
                 admin.gender = gender
-                admin.save()
+                admin.save(update_fields=dirty)
                 staff.save()
                 messages.success(request, "Profile Updated!")
                 return redirect(reverse('staff_view_profile'))
@@ -244,17 +339,20 @@ def staff_view_profile(request):
 def staff_fcmtoken(request):
     token = request.POST.get('token')
     try:
-        staff_user = get_object_or_404(CustomUser, id=request.user.id)
-        staff_user.fcm_token = token
-        staff_user.save()
-        return HttpResponse("True")
+        # One narrow UPDATE instead of a SELECT plus a full-row save
+        updated = CustomUser.objects.filter(
+            id=request.user.id).update(fcm_token=token)
+        return HttpResponse("True" if updated else "False")
     except Exception as e:
         return HttpResponse("False")
 
 
 def staff_view_notification(request):
     staff = get_object_or_404(Staff, admin=request.user)
-    notifications = NotificationStaff.objects.filter(staff=staff)
+    # The template renders message and created_at only; the explicit
+    # ordering matches the (staff, -created_at) index
+    notifications = NotificationStaff.objects.filter(staff=staff).only(
+        'id', 'message', 'created_at').order_by('-created_at')
     context = {
         'notifications': notifications,
         'page_title': "View Notifications"
@@ -264,12 +362,10 @@ def staff_view_notification(request):
 
 def staff_add_result(request):
     staff = get_object_or_404(Staff, admin=request.user)
-    subjects = Subject.objects.filter(staff=staff)
-    sessions = Session.objects.all()
     context = {
         'page_title': 'Result Upload',
-        'subjects': subjects,
-        'sessions': sessions
+        'subjects': _staff_subjects(staff),
+        'sessions': _all_sessions()
     }
     if request.method == 'POST':
         try:
@@ -278,18 +374,18 @@ def staff_add_result(request):
             test = request.POST.get('test')
             exam = request.POST.get('exam')
             student = get_object_or_404(Student, id=student_id)
-            subject = get_object_or_404(Subject, id=subject_id)
-            try:
-                data = StudentResult.objects.get(
-                    student=student, subject=subject)
-                data.exam = exam
-                data.test = test
-                data.save()
-                messages.success(request, "Scores Updated")
-            except:
-                result = StudentResult(student=student, subject=subject, test=test, exam=exam)
-                result.save()
+            subject = _get_subject(subject_id)
+            # One upsert instead of get-then-save, with no bare except
+            # hiding real errors between the two writes; atomic so the
+            # SELECT/INSERT pair commits (and fsyncs) once
+            with transaction.atomic():
+                result, created = StudentResult.objects.update_or_create(
+                    student=student, subject=subject,
+                    defaults={'test': test, 'exam': exam})
+            if created:
                 messages.success(request, "Scores Saved")
+            else:
+                messages.success(request, "Scores Updated")
         except Exception as e:
             messages.warning(request, "Error Occured While Processing Form")
     return render(request, "staff_template/staff_add_result.html", context)
@@ -301,7 +397,7 @@ def fetch_student_result(request):
         subject_id = request.POST.get('subject')
         student_id = request.POST.get('student')
         student = get_object_or_404(Student, id=student_id)
-        subject = get_object_or_404(Subject, id=subject_id)
+        subject = _get_subject(subject_id)
         result = StudentResult.objects.get(student=student, subject=subject)
         result_data = {
             'exam': result.exam,
@@ -160,7 +160,7 @@ def student_view_profile(request):
     """
     学生查看/编辑个人资料功能
     """
-    student = get_object_or_404(Student, admin=request.user)
+    student = get_object_or_404(Student.objects.select_related('admin'), admin=request.user)
     form = StudentEditForm(request.POST or None, request.FILES or None,
                            instance=student)
     context = {'form': form,
@@ -0,0 +1,62 @@
+"""Deferred persistence for the write-heavy attendance endpoints.
+
+With Celery installed the persist functions run on worker processes and
+the AJAX views answer 202 Accepted as soon as the payload is validated,
+freeing the web worker before the batch commits. Celery is optional for
+this project, so without it .delay falls back to running the work inline
+and the endpoints behave as before.
+"""
+from django.db import transaction
+
+from .attendance_bitmap import refresh_status_bitmap
+from .models import Attendance, AttendanceReport, Student
+
+try:
+    from celery import shared_task
+except ImportError:  # Celery is optional; run tasks inline without it
+    def shared_task(func):
+        func.delay = func
+        return func
+
+
+@shared_task
+def persist_attendance(attendance_id, rows):
+    """Create missing attendance reports; rows is [(student_id, status)]."""
+    attendance = Attendance.objects.get(pk=attendance_id)
+    with transaction.atomic():
+        ids = [student_id for student_id, _ in rows]
+        student_map = Student.objects.in_bulk(ids)
+        existing = set(AttendanceReport.objects.filter(
+            attendance=attendance, student_id__in=ids
+        ).values_list('student_id', flat=True))
+        new_reports = []
+        for student_id, status in rows:
+            student = student_map.get(student_id)
+            if student is None or student_id in existing:
+                continue  # unknown or already-recorded student
+            new_reports.append(AttendanceReport(
+                attendance=attendance, student=student, status=status))
+        AttendanceReport.objects.bulk_create(
+            new_reports, batch_size=500, ignore_conflicts=True)
+        refresh_status_bitmap(attendance)
+
+
+@shared_task
+def persist_attendance_updates(attendance_id, rows):
+    """Rewrite report statuses; rows is [(admin_id, status)]."""
+    attendance = Attendance.objects.get(pk=attendance_id)
+    with transaction.atomic():
+        admin_ids = [admin_id for admin_id, _ in rows]
+        student_map = dict(Student.objects.filter(
+            admin_id__in=admin_ids).values_list('admin_id', 'id'))
+        status_by_student = {
+            student_map[admin_id]: status
+            for admin_id, status in rows if admin_id in student_map
+        }
+        reports = list(AttendanceReport.objects.filter(
+            attendance=attendance, student_id__in=status_by_student))
+        for report in reports:
+            report.status = status_by_student[report.student_id]
+        AttendanceReport.objects.bulk_update(
+            reports, ['status'], batch_size=500)
+        refresh_status_bitmap(attendance)
@@ -15,7 +15,7 @@ Including another URLconf
 """
 from django.urls import path
 
-from main_app.EditResultView import EditResultView
+from main_app.EditResultView import EditResultView, EditResultsBulkView
 
 from . import hod_views, staff_views, student_views, views
 
@@ -108,6 +108,8 @@ urlpatterns = [
     path("staff/result/add/", staff_views.staff_add_result, name='staff_add_result'),
     path("staff/result/edit/", EditResultView.as_view(),
          name='edit_student_result'),
+    path("staff/result/edit/bulk/", EditResultsBulkView.as_view(),
+         name='edit_student_results_bulk'),
     path('staff/result/fetch/', staff_views.fetch_student_result,
          name='fetch_student_result'),
 